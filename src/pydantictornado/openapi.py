@@ -1,13 +1,16 @@
 import collections.abc
+import copy
 import datetime
 import functools
 import inspect
 import ipaddress
 import re
+import sys
 import types
 import typing
 import uuid
 import warnings
+import weakref
 
 import pydantic
 import tornado.routing
@@ -55,13 +58,11 @@ class SchemaExtra:
         return v
 
 
-# this is used to detect annotated types in _describe_type
-AnnotationType = type(typing.Annotated[object, 'ignored'])
+class OpenAPIPath(typing.NamedTuple):
+    """OpenAPI path and the patterns of its path parameters"""
 
-
-class OpenAPIPath(pydantic.BaseModel):
     path: str = ''
-    patterns: dict[str, str] = pydantic.Field(default_factory=dict)
+    patterns: collections.abc.Mapping[str, str] = types.MappingProxyType({})
 
 
 class Parameter(util.FieldOmittingMixin, pydantic.BaseModel):
@@ -131,13 +132,14 @@ class Operation(util.FieldOmittingMixin, pydantic.BaseModel):
         'deprecated',
         'responses',
     )
-    OMIT_IF_EMPTY = ('tags', 'responses')
+    OMIT_IF_EMPTY = ('tags', 'responses', 'parameters')
 
     summary: str | None = None
     description: str | None = None
     operationId: str | None = None  # noqa: N815 -- camelCase ok here
     deprecated: bool | None = None
     tags: list[str] = pydantic.Field(default_factory=list)
+    parameters: list[Parameter] = pydantic.Field(default_factory=list)
     responses: dict[ResponseStatus, ResponseObject] = pydantic.Field(
         default_factory=dict
     )
@@ -172,29 +174,46 @@ class PathDescription(util.FieldOmittingMixin, pydantic.BaseModel):
         )
 
 
-def _initialize_type_map(
-    m: collections.abc.MutableMapping[type, dict[str, typing.Any]],
-) -> None:
-    m.update(
+_SchemaTemplate: typing.TypeAlias = collections.abc.Mapping[str, typing.Any]
+
+_SIMPLE_TYPE_SCHEMAS: collections.abc.Mapping[type, _SchemaTemplate] = (
+    types.MappingProxyType(
         {
-            bool: {'type': 'boolean'},
-            datetime.date: {'type': 'string', 'format': 'date'},
-            datetime.datetime: {'type': 'string', 'format': 'date-time'},
-            datetime.time: {'type': 'string', 'format': 'time'},
-            datetime.timedelta: {'type': 'string', 'format': 'duration'},
-            float: {'type': 'number'},
-            int: {'type': 'integer'},
-            ipaddress.IPv4Address: {'type': 'string', 'format': 'ipv4'},
-            ipaddress.IPv6Address: {'type': 'string', 'format': 'ipv6'},
-            str: {'type': 'string'},
-            types.NoneType: {'type': 'null'},
-            uuid.UUID: {'type': 'string', 'format': 'uuid'},
-            yarl.URL: {'type': 'string', 'format': 'uri'},
+            cls: types.MappingProxyType(schema)
+            for cls, schema in {
+                bool: {'type': 'boolean'},
+                datetime.date: {'type': 'string', 'format': 'date'},
+                datetime.datetime: {'type': 'string', 'format': 'date-time'},
+                datetime.time: {'type': 'string', 'format': 'time'},
+                datetime.timedelta: {'type': 'string', 'format': 'duration'},
+                float: {'type': 'number'},
+                int: {'type': 'integer'},
+                ipaddress.IPv4Address: {'type': 'string', 'format': 'ipv4'},
+                ipaddress.IPv6Address: {'type': 'string', 'format': 'ipv6'},
+                str: {'type': 'string'},
+                types.NoneType: {'type': 'null'},
+                uuid.UUID: {'type': 'string', 'format': 'uuid'},
+                yarl.URL: {'type': 'string', 'format': 'uri'},
+            }.items()
         }
     )
+)
+"""Schemas for types that are described without inspection
+
+Exact matches are looked up directly in this table. Subclasses of
+these types are resolved through `_simple_type_map`. The schemas are
+read-only templates that are merged into a new dict when described.
+
+"""
+
+
+def _initialize_type_map(
+    m: collections.abc.MutableMapping[type, _SchemaTemplate],
+) -> None:
+    m.update(_SIMPLE_TYPE_SCHEMAS)
 
 
-_simple_type_map = util.ClassMapping[dict[str, typing.Any]](
+_simple_type_map = util.ClassMapping[_SchemaTemplate](
     initialize_data=_initialize_type_map
 )
 
@@ -226,55 +245,104 @@ class APIDescription(pydantic.BaseModel):
 
 def describe_api(application: tornado.web.Application) -> APIDescription:
     """Describe an application in an OpenAPI specification"""
-    spec = APIDescription(
-        openapi='3.1.0',
-        info={},
-        jsonSchemaDialect='https://spec.openapis.org/oas/3.1/dialect/base',
-        servers=[],
-        paths={},
-        components={},
-        tags=[],
-    )
+    paths: dict[str, PathDescription] = {}
+    seen_patterns: set[tuple[str, int]] = set()
     for rule in application.wildcard_router.rules:
         if isinstance(rule, routing.Route | tornado.routing.URLSpec):
-            path = _translate_path_pattern(rule.regex)
-            description = _describe_path(rule, path)
-            if not description.empty:
-                spec.paths[path.path] = description
+            # tornado dispatches to the first matching rule so a rule
+            # with the same regular expression as an earlier rule is
+            # never reached
+            pattern_key = (rule.regex.pattern, int(rule.regex.flags))
+            if pattern_key in seen_patterns:
+                continue
+            seen_patterns.add(pattern_key)
+
+            path, description = _describe_rule(rule)
+            if description.empty:
+                continue
+            if (existing := paths.get(path.path)) is None:
+                paths[path.path] = description
+            else:
+                _merge_path_description(existing, description)
         else:
             warnings.warn(
                 f'Rule {rule!r} not processed, unhandled rule '
                 f'class {rule.__class__.__name__}',
                 stacklevel=2,
             )
-    return spec
+    return APIDescription(
+        openapi='3.1.0',
+        info={},
+        jsonSchemaDialect='https://spec.openapis.org/oas/3.1/dialect/base',
+        servers=[],
+        paths=paths,
+        components={},
+        tags=[],
+    )
+
+
+_rule_descriptions: weakref.WeakKeyDictionary[
+    tornado.routing.URLSpec, tuple[OpenAPIPath, PathDescription]
+] = weakref.WeakKeyDictionary()
+
+
+def _describe_rule(
+    rule: tornado.routing.URLSpec,
+) -> tuple[OpenAPIPath, PathDescription]:
+    """Describe `rule` reusing the result from a previous call
+
+    Rules are effectively immutable once they are added to an
+    application so the description is cached for the lifetime of
+    the rule. The description is copied since the caller owns the
+    result.
+
+    """
+    try:
+        path, description = _rule_descriptions[rule]
+    except KeyError:
+        path = _translate_path_pattern(rule.regex)
+        description = _describe_path(rule, path)
+        # freeze the patterns since the path is shared without copying
+        path = path._replace(
+            patterns=types.MappingProxyType(
+                {sys.intern(k): v for k, v in path.patterns.items()}
+            )
+        )
+        _rule_descriptions[rule] = (path, description)
+    return path, description.model_copy(deep=True)
 
 
 def describe_type(t: Describable) -> Description:
     """Describe `t` as an OpenAPI schema"""
-    return types.MappingProxyType(_describe_type(t))
+    try:
+        hash(t)
+    except TypeError:  # eg, annotated with unhashable metadata
+        return types.MappingProxyType(_describe_type(t))
+    return _cached_describe_type(t)
 
 
-# mypy gets cranky about the hash-ability of `Describable` or something
-# so don't enable the cache while checking types
-if not typing.TYPE_CHECKING:  # pragma: nobranch
-    describe_type = functools.cache(describe_type)
+@functools.lru_cache(maxsize=1024)
+def _cached_describe_type(t: collections.abc.Hashable) -> Description:
+    return types.MappingProxyType(_describe_type(t))
 
 
 def _describe_type(t: Describable) -> MutableDescription:
     alias_args = None
     if isinstance(t, types.GenericAlias):
-        alias_args, t = typing.get_args(t), typing.get_origin(t)
+        t, alias_args = _origin_and_args(t)
 
     t, openapi_extra = _extract_extra(t)
 
     if isinstance(t, types.UnionType):
         return openapi_extra.apply(
             {
-                'anyOf': [
-                    _describe_type(union_member)
-                    for union_member in typing.get_args(t)
-                ]
+                'anyOf': _unique(
+                    # Optional is common enough to skip the recursion
+                    {'type': 'null'}
+                    if union_member is types.NoneType
+                    else _describe_type(union_member)
+                    for union_member in t.__args__
+                )
             }
         )
 
@@ -284,12 +352,12 @@ def _describe_type(t: Describable) -> MutableDescription:
     if not isinstance(t, type):
         raise TypeError(f'Unexpected value of type {type(t)}')  # noqa: TRY003
 
-    if issubclass(t, pydantic.BaseModel):
-        return openapi_extra.apply(t.model_json_schema())
-
-    unspecified = {'': object()}
-    if (v := _simple_type_map.get(t, unspecified)) is not unspecified:
-        return openapi_extra.apply(v.copy())
+    if (schema := _SIMPLE_TYPE_SCHEMAS.get(t)) is None:
+        if issubclass(t, pydantic.BaseModel):
+            return openapi_extra.apply(_describe_model(t))
+        schema = _simple_type_map.get(t, None)
+    if schema is not None:
+        return {**schema, **openapi_extra.extra}
 
     if issubclass(t, collections.abc.Mapping):
         return openapi_extra.apply({'type': 'object'})
@@ -300,16 +368,78 @@ def _describe_type(t: Describable) -> MutableDescription:
     raise ValueError(f'Unexpected value of type {type(t)}')  # noqa: TRY003
 
 
+def _unique(
+    schemas: collections.abc.Iterable[MutableDescription],
+) -> list[MutableDescription]:
+    """Remove duplicate schemas retaining the first occurrence
+
+    Schemas may contain unhashable or non-JSON values so this
+    uses equality comparison. The lists are always short.
+
+    """
+    unique: list[MutableDescription] = []
+    for schema in schemas:
+        if schema not in unique:
+            unique.append(schema)
+    return unique
+
+
+def _origin_and_args(
+    t: Describable,
+) -> tuple[typing.Any, tuple[typing.Any, ...]]:
+    """Return the origin and arguments of a generic type
+
+    This reads the attributes directly instead of calling
+    typing.get_origin() and typing.get_args(). The results only
+    differ for `typing.Annotated` which is unwrapped by the caller
+    before this is called.
+
+    """
+    return getattr(t, '__origin__', None), getattr(t, '__args__', ())
+
+
+_model_schemas: weakref.WeakKeyDictionary[
+    type[pydantic.BaseModel], MutableDescription
+] = weakref.WeakKeyDictionary()
+
+
+def _describe_model(model: type[pydantic.BaseModel]) -> MutableDescription:
+    """Return a copy of the JSON schema for `model`
+
+    Generating a model's JSON schema is expensive and the result
+    only depends on the class, so it is generated once per class.
+
+    """
+    try:
+        schema = _model_schemas[model]
+    except KeyError:
+        schema = _model_schemas[model] = model.model_json_schema()
+    return copy.deepcopy(schema)
+
+
 def _describe_literals(t: Describable) -> MutableDescription | None:
+    if isinstance(t, type):  # fast path, literals are never classes
+        return None
     if t is None:
         return {'type': 'null'}
     if t is typing.LiteralString:
         return {'type': 'string'}
-    if typing.get_origin(t) is typing.Literal:
+    origin, args = _origin_and_args(t)
+    if origin is typing.Literal:
+        # values of the same type are folded into a single enum
+        grouped: dict[type, list[object]] = {}
+        for arg in args:
+            grouped.setdefault(type(arg), []).append(arg)
         options = []
-        for arg in typing.get_args(t):
-            options.append(_describe_type(type(arg)))
-            options[-1]['const'] = arg
+        for arg_type, values in grouped.items():
+            if (schema := _SIMPLE_TYPE_SCHEMAS.get(arg_type)) is not None:
+                options.append(dict(schema))
+            else:
+                options.append(_describe_type(arg_type))
+            if len(values) == 1:
+                options[-1]['const'] = values[0]
+            else:
+                options[-1]['enum'] = values
         if len(options) > 1:
             return {'anyOf': options}
         return options[0]
@@ -340,6 +470,26 @@ def _describe_collection(
     return description
 
 
+def _merge_path_description(
+    target: PathDescription, source: PathDescription
+) -> None:
+    """Add the operations from `source` that `target` lacks
+
+    Rules with different patterns can translate to the same OpenAPI
+    path, eg ``/items/(?P<id>\\d+)`` and ``/items/(?P<id>[a-z]+)``.
+    The first rule wins for each HTTP method. If the path parameters
+    differ, the merged operations carry their own parameters since
+    operation parameters override the path-level ones.
+    """
+    for name in _OPERATION_NAMES:
+        op = getattr(source, name)
+        if op is None or getattr(target, name) is not None:
+            continue
+        if source.parameters != target.parameters:
+            op.parameters = list(source.parameters)
+        setattr(target, name, op)
+
+
 def _describe_path(
     route: tornado.routing.URLSpec, path_info: OpenAPIPath
 ) -> PathDescription:
@@ -359,25 +509,55 @@ def _describe_path(
             if not isinstance(op, Omit):
                 setattr(desc, method.lower(), op)
     elif issubclass(route.handler_class, tornado.web.RequestHandler):
-        for method in route.handler_class.SUPPORTED_METHODS:
-            impl = getattr(route.handler_class, method.lower())
-            if impl != route.handler_class._unimplemented_method:  # noqa: SLF001
-                op = _describe_operation(impl)
-                if not isinstance(op, Omit):
-                    setattr(desc, method.lower(), op)
+        for method, op in _describe_handler(route.handler_class).items():
+            setattr(desc, method, op.model_copy(deep=True))
 
     return desc
 
 
+_handler_operations: weakref.WeakKeyDictionary[
+    type[tornado.web.RequestHandler], dict[str, Operation]
+] = weakref.WeakKeyDictionary()
+
+
+def _describe_handler(
+    handler_class: type[tornado.web.RequestHandler],
+) -> collections.abc.Mapping[str, Operation]:
+    """Describe the implemented methods of a request handler class
+
+    The same handler class is frequently routed to by more than one
+    rule so the operations are cached for the lifetime of the class.
+
+    """
+    try:
+        return _handler_operations[handler_class]
+    except KeyError:
+        pass
+
+    operations: dict[str, Operation] = {}
+    for method in handler_class.SUPPORTED_METHODS:
+        impl = getattr(handler_class, method.lower())
+        if impl != handler_class._unimplemented_method:  # noqa: SLF001
+            op = _describe_operation(impl)
+            if not isinstance(op, Omit):
+                operations[method.lower()] = op
+    _handler_operations[handler_class] = operations
+    return operations
+
+
+_PATH_PARAMETER_DEFAULTS: collections.abc.Mapping[str, object] = (
+    types.MappingProxyType({'in': 'path', 'required': True})
+)
+
+
 def _describe_path_parameter(
     name: str,
     pattern: str,
     route: tornado.routing.URLSpec,
 ) -> Parameter:
     defaults = {
+        **_PATH_PARAMETER_DEFAULTS,
         'name': name,
-        'in': 'path',
-        'required': True,
         'schema': {'type': 'string'},
     }
     if route.kwargs and (
@@ -394,8 +574,12 @@ def _describe_path_parameter(
 def _describe_operation(
     func: request_handling.RequestMethod
 ) -> Operation | Omit:
-    if metadata.collect(func, Omit):
-        return Omit()
+    annotations: list[OperationAnnotation] = []
+    for meta in metadata.extract(func):
+        if isinstance(meta, Omit):
+            return meta
+        if isinstance(meta, OperationAnnotation):
+            annotations.append(meta)
 
     op = Operation()
     if doc := inspect.getdoc(func):
@@ -408,7 +592,7 @@ def _describe_operation(
         )
         op.responses['default'] = resp
 
-    for meta in metadata.collect(func, OperationAnnotation):
+    for meta in annotations:
         op.summary = util.apply_default(op.summary, meta.summary)
         op.description = util.apply_default(op.description, meta.description)
         op.operationId = util.apply_default(op.operationId, meta.operation_id)
@@ -418,10 +602,10 @@ def _describe_operation(
 
 
 def _update_operation_from_docstring(op: Operation, docstring: str) -> None:
-    lines = docstring.splitlines()
-    op.summary = lines.pop(0)
-    if lines and lines[0].strip() == '':
-        op.description = '\n'.join(lines[1:])
+    op.summary, _, rest = docstring.partition('\n')
+    separator, _, description = rest.partition('\n')
+    if rest and not separator.strip():
+        op.description = description
 
 
 def _describe_parameter(param_info: object, **defaults: object) -> Parameter:
@@ -436,6 +620,7 @@ def _describe_parameter(param_info: object, **defaults: object) -> Parameter:
                 param.description, item.description
             )
     if alternatives:
+        alternatives = _unique(alternatives)
         if len(alternatives) == 1:
             param.schema_.update(alternatives[0])
         else:
@@ -443,18 +628,24 @@ def _describe_parameter(param_info: object, **defaults: object) -> Parameter:
     return param
 
 
+_NO_EXTRA = SchemaExtra()
+"""Shared empty extra for unannotated types -- never update this"""
+
+
 def _extract_extra(t: Describable) -> tuple[Describable, SchemaExtra]:
-    unwrapped = t
+    if not util.is_annotated(t):
+        return t, _NO_EXTRA
+    unwrapped, md = util.unwrap_annotation(t)
+    extras = [meta for meta in md if isinstance(meta, SchemaExtra)]
+    if not extras:
+        return unwrapped, _NO_EXTRA
     extra = SchemaExtra()
-    if util.is_annotated(t):
-        unwrapped, md = util.unwrap_annotation(t)
-        for meta in md:
-            if isinstance(meta, SchemaExtra):
-                extra.update(meta)
+    for meta in extras:
+        extra.update(meta)
     return unwrapped, extra
 
 
-def _translate_path_pattern(pattern: re.Pattern[str]) -> OpenAPIPath:
+def _translate_path_pattern(pattern: str | re.Pattern[str]) -> OpenAPIPath:
     r"""Translate a path regex into an OpenAPI path
 
     This function tries to parse a Tornado path expression into a
@@ -462,58 +653,104 @@ def _translate_path_pattern(pattern: re.Pattern[str]) -> OpenAPIPath:
     regular expression patterns. Not all patterns supported by
     the [re][] module implements. If you stumble into an unsupported
     expression, it will be left as-is and a warning is issued.
+    The pattern may be passed as a string which avoids compiling
+    an expression only to read its source back.
 
-    >>> info = _translate_path_pattern(re.compile(
-    ...    r'/projects/(?P<id>[1-9]\d*)/facts/(?P<fact_id>\d+)'))
+    >>> info = _translate_path_pattern(
+    ...    r'/projects/(?P<id>[1-9]\d*)/facts/(?P<fact_id>\d+)')
     >>> info.path
-    '/projects/{id}/facts/fact_id'
+    '/projects/{id}/facts/{fact_id}'
     >>> info.patterns['id']
-    '[1-9]\d*'
+    '[1-9]\\d*'
     >>> info.patterns['fact_id']
-    '\d+'
+    '\\d+'
 
     """
-    working = pattern.pattern.removesuffix('$')
-
+    if isinstance(pattern, re.Pattern):
+        pattern = pattern.pattern
+    working = pattern.removesuffix('$')
+
+    # The pattern is processed in a single left-to-right pass. Each
+    # open group pushes a (prefix, name, output) frame onto the stack
+    # and the closing paren pops it into the enclosing output. Named
+    # groups are replaced by `{name}` in the enclosing output.
     patterns: dict[str, str] = {}
-    while match := re.search(r'\((?P<part>\?[^()]*)\)', working):
-        quantifier, value = match['part'][:2], match['part'][2:]
-        start, end = match.span()
-        if quantifier == '?P':
-            if match := re.search(r'<(?P<name>[^>]+)>', value):
-                value = value[match.end() :]
-                patterns[match['name']] = value
-                value = f'{{{match["name"]}}}'
-            elif value.startswith('='):
-                value = f'{{{value[1:]}}}'
-            else:  # pragma: nocover
-                raise RuntimeError('Invalid regular expression')  # noqa: TRY003
-        elif quantifier == '?#':
-            value = ''
-        elif quantifier == '?:':
-            # Escape the parens here to avoid the top-level
-            # matching pattern from reprocessing this value.
-            value = f'\x01{value}\x02'
+    stack: list[_PathFrame] = [('', None, [])]
+    index, length = 0, len(working)
+    while index < length:
+        char = working[index]
+        output = stack[-1][2]
+        if char == '\\':
+            output.append(working[index : index + 2])
+            index += 2
+        elif char == '[':
+            end = _find_class_end(working, index)
+            output.append(working[index:end])
+            index = end
+        elif char == ')':
+            prefix, name, content = stack.pop()
+            if name is None:
+                stack[-1][2].extend((prefix, *content, ')'))
+            else:
+                patterns[name] = ''.join(content)
+                stack[-1][2].append(f'{{{name}}}')
+            index += 1
+        elif char == '(':
+            index = _open_group(working, index, stack)
         else:
-            warnings.warn(
-                f'{quantifier!r} is not implemented and will result in '
-                f'an invalid OpenAPI path expression',
-                stacklevel=2,
-            )
-        working = working[:start] + value + working[end:]
-
-    # reverse the parenthesis escaping in the path and every
-    # parsed expression
-    working = working.replace('\x01', '(').replace('\x02', ')')
-    for var, patn in patterns.items():
-        patterns[var] = patn.replace('\x01', '(').replace('\x02', ')')
+            output.append(char)
+            index += 1
 
+    working = ''.join(stack[0][2])
     return OpenAPIPath(
         patterns=patterns,
         path='/' if working == '/?' else working.removesuffix('/?'),
     )
 
 
+_PathFrame: typing.TypeAlias = tuple[str, str | None, list[str]]
+
+
+def _open_group(working: str, index: int, stack: list[_PathFrame]) -> int:
+    """Process the group starting at `index` and return the next index"""
+    kind = working[index + 1 : index + 3]
+    if kind == '?P':
+        if working[index + 3] == '=':  # back reference
+            end = working.index(')', index)
+            stack[-1][2].append(f'{{{working[index + 4 : end]}}}')
+        else:
+            end = working.index('>', index)
+            stack.append(('', working[index + 4 : end], []))
+        return end + 1
+    if kind == '?#':
+        return working.index(')', index) + 1
+    if kind == '?:':
+        stack.append(('(', None, []))
+        return index + 3
+    if kind[:1] == '?':
+        warnings.warn(
+            f'{kind!r} is not implemented and will result in an '
+            f'invalid OpenAPI path expression',
+            stacklevel=3,
+        )
+        stack.append(('(?', None, []))
+        return index + 2
+    stack.append(('(', None, []))
+    return index + 1
+
+
+def _find_class_end(working: str, index: int) -> int:
+    """Find the index just past the character class starting at `index`"""
+    index += 1
+    if working.startswith('^', index):
+        index += 1
+    if working.startswith(']', index):  # leading ] is a literal
+        index += 1
+    while working[index] != ']':
+        index += 2 if working[index] == '\\' else 1
+    return index + 1
+
+
 @typing.overload
 def describe_operation(
     f: request_handling.RequestMethod, /, **kwargs: str | bool | list[str]
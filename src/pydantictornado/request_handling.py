@@ -1,5 +1,6 @@
 import collections.abc
 import datetime
+import functools
 import inspect
 import ipaddress
 import json
@@ -51,6 +52,13 @@ def identity_transform_factory() -> PathCoercion:
     return lambda s: s
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_signature(func: RequestMethod) -> inspect.Signature:
+    # Evaluating string annotations is expensive and the result
+    # is the same for every request that the function handles.
+    return inspect.signature(func, eval_str=True)
+
+
 class RequestHandler(web.RequestHandler):
     implementations: dict[str, RequestMethod]
     logger: logging.Logger
@@ -106,7 +114,7 @@ class RequestHandler(web.RequestHandler):
             raise web.HTTPError(500)  # pragma: nocover -- should not happen!
 
         func = self.implementations[self.request.method]
-        sig = inspect.signature(func, eval_str=True)
+        sig = _get_signature(func)
 
         try:
             kwargs = {
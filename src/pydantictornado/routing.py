@@ -142,6 +142,8 @@ class ParameterAnnotation(pydantic.BaseModel):
     https://spec.openapis.org/oas/latest.html#parameter-object
     """
 
+    model_config = pydantic.ConfigDict(frozen=True, extra='forbid')
+
     description: str | None = None
     schema_: dict[str, object] = pydantic.Field(default_factory=dict)
     style: ParameterStyle | None = None
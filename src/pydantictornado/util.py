@@ -5,6 +5,7 @@ import functools
 import inspect
 import ipaddress
 import logging
+import re
 import types
 import typing
 import uuid
@@ -27,9 +28,21 @@ DataInitializer = typing.Callable[
 ]
 
 
+@typing.final
 class Unspecified:
     """Simple type that is never true"""
 
+    __slots__ = ()
+
+    _instance: typing.ClassVar['Unspecified | None'] = None
+
+    def __new__(cls) -> 'Unspecified':
+        # NB ... sharing a single instance lets callers use identity
+        # comparisons against UNSPECIFIED
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __bool__(self) -> bool:  # pragma: nocover
         # note that this method may or may not be necessary based
         # on the implementation ... I'm leaving it here to avoid
@@ -46,6 +59,10 @@ BOOLEAN_FALSE_STRINGS: set[str] = set()
 UNSPECIFIED = Unspecified()
 """An unspecified value when `None` is not appropriate"""
 
+# matches the shortened ISO-8601 forms that fromisoformat rejects:
+# YYYY, YYYY-MM, and YYYYMM
+_SHORT_DATE_PATTERN = re.compile(r'(?P<year>\d{4})(?:-?(?P<month>\d{1,2}))?')
+
 
 def apply_default(
     value: T,
@@ -58,14 +75,13 @@ def apply_default(
     when *both* `value` and `default` are one of the "defaulted"
     values (eg, `None`, `...`, `UNSPECIFIED`).
     """
-    if default in (UNSPECIFIED, None, ...) or isinstance(default, Unspecified):
+    if default is UNSPECIFIED or default is None or default is ...:
         return value
-    if value in (UNSPECIFIED, None, ...) or isinstance(value, Unspecified):
+    if value is UNSPECIFIED or value is None or value is ...:
         return typing.cast(T, default)
     return value
 
 
-@functools.cache
 def get_logger_for(obj: object) -> logging.Logger:
     """Retrieve a logger for obj.__class__
 
@@ -77,10 +93,16 @@ def get_logger_for(obj: object) -> logging.Logger:
     'util.C'
 
     """
-    if isinstance(obj, types.FunctionType):
-        return logging.getLogger(obj.__module__).getChild(obj.__name__)
-    cls = obj if isinstance(obj, type) else type(obj)
-    return logging.getLogger(cls.__module__).getChild(cls.__name__)
+    # NB ... the cache is keyed by the class (or function) so that
+    # instances are not kept alive by the cache
+    if not isinstance(obj, type | types.FunctionType):
+        obj = type(obj)
+    return _get_logger(obj)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_logger(obj: type | types.FunctionType) -> logging.Logger:
+    return logging.getLogger(obj.__module__).getChild(obj.__name__)
 
 
 class FieldOmittingMixin(pydantic.BaseModel):
@@ -98,22 +120,46 @@ class FieldOmittingMixin(pydantic.BaseModel):
     OMIT_IF_EMPTY: typing.ClassVar[tuple[str, ...]] = ()
     OMIT_IF_NONE: typing.ClassVar[tuple[str, ...]] = ()
 
+    # calculated from the OMIT_IF_ values when a subclass is created,
+    # candidates are (field name, serialization alias) pairs
+    _omit_if_empty: typing.ClassVar[frozenset[str]] = frozenset()
+    _omit_if_none: typing.ClassVar[frozenset[str]] = frozenset()
+    _omit_candidates: typing.ClassVar[tuple[tuple[str, str], ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: object) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._omit_if_empty = frozenset(cls.OMIT_IF_EMPTY)
+        cls._omit_if_none = frozenset(cls.OMIT_IF_NONE)
+        cls._omit_candidates = tuple(
+            (name, field.serialization_alias or name)
+            for name, field in cls.model_fields.items()
+            if name in cls._omit_if_empty or name in cls._omit_if_none
+        )
+
     @pydantic.model_serializer(mode='wrap')
     def _omit_fields(
         self,
-        handler: typing.Callable[
-            [typing.Self, pydantic.SerializationInfo], dict[str, object]
-        ],
-        info: pydantic.SerializationInfo,
+        handler: pydantic.SerializerFunctionWrapHandler,
     ) -> dict[str, object]:
-        result = handler(self, info)
-        for name in self.model_fields:
-            value = result.get(name, None)
-            empty = isinstance(value, collections.abc.Sized) and not len(value)
-            if (name in self.OMIT_IF_NONE and value is None) or (
-                name in self.OMIT_IF_EMPTY and empty
+        result: dict[str, object] = handler(self)
+        for name, alias in self._omit_candidates:
+            # NB ... aliases are used when by_alias is passed or when
+            # the model sets serialize_by_alias so look for the alias
+            # first and fall back to the field name
+            key = alias
+            value = result.get(key, UNSPECIFIED)
+            if value is UNSPECIFIED:
+                key = name
+                value = result.get(key, UNSPECIFIED)
+            # NB ... probing for __len__ is equivalent to checking for
+            # collections.abc.Sized without going through ABCMeta
+            if (value is None and name in self._omit_if_none) or (
+                name in self._omit_if_empty
+                and (length := getattr(type(value), '__len__', None))
+                and not length(value)
             ):
-                result.pop(name)
+                del result[key]
         return result
 
 
@@ -142,11 +188,29 @@ class ClassMapping(collections.abc.MutableMapping[type, T]):
       ...
     TypeError: list[int] is a types.GenericAlias, not a type
 
+    Lookups return the first registered type that matches. A new
+    type is inserted ahead of the first registered type that it is
+    a subclass of, otherwise it is appended.
+
+    Lookups are cached by type. The cache is cleared whenever it
+    grows past `MAX_CACHE_SIZE` entries so that processes that see
+    an unbounded number of dynamically created types do not leak.
+
     :param DataInitializer initialize_data: function to call
         to initialize or re-initialize the maps data
 
     """
 
+    __slots__ = (
+        '_bases',
+        '_cache',
+        '_initialize_data',
+        '_values',
+        'logger',
+    )
+
+    MAX_CACHE_SIZE: typing.ClassVar[int] = 1024
+
     def __init__(
         self,
         data: collections.abc.Mapping[type, T] | object = UNSPECIFIED,
@@ -156,19 +220,21 @@ class ClassMapping(collections.abc.MutableMapping[type, T]):
         self.logger = logging.getLogger(__package__).getChild(
             self.__class__.__name__
         )
-        self._data: list[tuple[type, T]] = []
+        # NB ... bases and values are parallel lists so that
+        # scanning the bases does not unpack (base, value) tuples
+        self._bases: list[type] = []
+        self._values: list[T] = []
         self._cache: dict[type, T] = {}
         self._initialize_data = initialize_data
         if data is not UNSPECIFIED:
-            data = typing.cast(collections.abc.Mapping[type, T], data)
-            for key, value in data.items():
-                self[key] = value
+            self.update(typing.cast(collections.abc.Mapping[type, T], data))
         if self._initialize_data is not None:
             self.rebuild()
 
     def rebuild(self) -> None:
         """Clear the mapping and re-initialize it"""
-        self._data.clear()
+        self._bases.clear()
+        self._values.clear()
         self._cache.clear()
         if self._initialize_data is not None:
             self._initialize_data(self)
@@ -176,7 +242,7 @@ class ClassMapping(collections.abc.MutableMapping[type, T]):
 
     def populate_cache(self) -> None:
         """Populate the internal cache for every mapped type"""
-        for key, _ in self._data:
+        for key in self._bases:
             self.__getitem__(key)
 
     @typing.overload
@@ -194,8 +260,19 @@ class ClassMapping(collections.abc.MutableMapping[type, T]):
         default: DefaultType | Unspecified = UNSPECIFIED,
     ) -> int | DefaultType:
         item = strip_annotation(item)
-        for index, data in enumerate(self._data):
-            base_cls, _ = data
+        if not isinstance(item, type):
+            raise errors.TypeRequiredError(item)
+        # NB ... the first matching base in insertion order wins.
+        # The scan is linear but its result is cached by type in
+        # __getitem__ so it only runs once per type.
+        if (index := self._scan(item)) is not None:
+            return index
+        if default is not UNSPECIFIED:
+            return typing.cast(DefaultType, default)
+        raise KeyError(item)
+
+    def _scan(self, item: type) -> int | None:
+        for index, base_cls in enumerate(self._bases):
             try:
                 is_subclass = issubclass(item, base_cls)
             except TypeError as error:
@@ -206,67 +283,146 @@ class ClassMapping(collections.abc.MutableMapping[type, T]):
                     error,
                 )
                 raise errors.TypeRequiredError(item) from None
-            else:
-                if is_subclass:
-                    return index
-        if not isinstance(default, Unspecified):
-            return default
-        raise KeyError(item)
+            if is_subclass:
+                return index
+        return None
 
     def __getitem__(self, item: type) -> T:
+        # NB ... the cache is keyed by plain types which is what we
+        # are almost always given so look for a hit before paying
+        # for strip_annotation(). Entering a try block is free so a
+        # hit costs a single dict probe.
+        cache = self._cache
+        try:
+            return cache[item]
+        except (KeyError, TypeError):  # unhashable, strip it and try again
+            pass
+
         item = strip_annotation(item)
         try:
-            coercion = self._cache[item]
+            return cache[item]
         except KeyError:
-            index = self._probe(item)
-            base_cls, coercion = self._data[index]
-            self._cache[item] = coercion
-            return coercion
+            pass
         except TypeError:
             raise errors.TypeRequiredError(item) from None
-        else:
-            return coercion
+
+        coercion = self._values[self._probe(item)]
+        if len(cache) >= self.MAX_CACHE_SIZE:
+            cache.clear()
+        cache[item] = coercion
+        return coercion
 
     def __setitem__(self, key: type, value: T) -> None:
+        key = self._insert(key, value)
+        self._cache.clear()
+        self._cache[key] = value
+
+    def update(  # type: ignore[override]
+        self,
+        other: (
+            collections.abc.Mapping[type, T]
+            | collections.abc.Iterable[tuple[type, T]]
+        ) = (),
+        /,
+    ) -> None:
+        """Insert several mappings and reset the cache once"""
+        if isinstance(other, collections.abc.Mapping):
+            other = other.items()
+        try:
+            for key, value in other:
+                self._insert(key, value)
+        finally:
+            # entries inserted before a failure are kept so the
+            # cache has to be reset either way
+            self._cache.clear()
+
+    def _insert(self, key: type, value: T) -> type:
         key = strip_annotation(key)
         if not isinstance(key, type):
             raise errors.TypeRequiredError(key)
-        self._cache.clear()
-        not_found = object()
-        if (index := self._probe(key, default=not_found)) is not not_found:
-            self._data.insert(index, (key, value))  # type: ignore[arg-type]
+        if (index := self._scan(key)) is not None:
+            self._bases.insert(index, key)
+            self._values.insert(index, value)
         else:
-            self._data.append((key, value))
-        self._cache[key] = value
+            self._bases.append(key)
+            self._values.append(value)
+        return key
 
     def __delitem__(self, key: type) -> None:
         key = strip_annotation(key)
         self._cache.clear()
-        for idx, (base_cls, _) in enumerate(self._data):
+        for idx, base_cls in enumerate(self._bases):
             if base_cls is key:
-                del self._data[idx]
+                del self._bases[idx]
+                del self._values[idx]
                 break
         else:
             raise IndexError(key)
 
     def __len__(self) -> int:
-        return len(self._data)
+        return len(self._bases)
 
     def __iter__(self) -> typing.Iterator[type]:
-        return iter(t[0] for t in self._data)
+        return iter(self._bases)
 
 
-@typing.runtime_checkable
 class HasIsoFormat(typing.Protocol):
-    """Runtime checkable protocol that detects the isoformat method"""
+    """Protocol that describes values with an isoformat method
+
+    This is only used for static typing.
+    """
 
     def isoformat(self, spec: str = ...) -> str:
         ...
 
 
-def json_serialize_hook(
-    obj: object,
-) -> bool | float | int | str | dict[str, object]:
+SerializedValue: typing.TypeAlias = (
+    bool | float | int | str | dict[str, object]
+)
+Serializer = typing.Callable[[typing.Any], SerializedValue]
+
+
+def _dump_model(model: pydantic.BaseModel) -> SerializedValue:
+    # Calling the compiled serializer directly skips the model_dump
+    # wrapper and its keyword plumbing. Models that override
+    # model_dump are still honored.
+    cls = type(model)
+    if cls.model_dump is not pydantic.BaseModel.model_dump:
+        return cls.model_dump(model, by_alias=True)
+    return cls.__pydantic_serializer__.to_python(model, by_alias=True)  # type: ignore[no-any-return]
+
+
+def _initialize_serializers(
+    m: collections.abc.MutableMapping[type, Serializer],
+) -> None:
+    m.update(
+        {
+            datetime.date: lambda value: value.isoformat(),
+            datetime.time: lambda value: value.isoformat(),
+            datetime.timedelta: _format_isoduration,
+            ipaddress.IPv4Address: str,
+            ipaddress.IPv6Address: str,
+            pydantic.BaseModel: _dump_model,
+            uuid.UUID: str,
+            yarl.URL: str,
+            # registered last so that it only matches types that
+            # nothing else does, and the result is cached by type
+            object: _serialize_other,
+        }
+    )
+
+
+def _serialize_other(obj: object) -> SerializedValue:
+    # NB ... isinstance() against a runtime checkable protocol is
+    # quite a bit slower than looking up the attribute directly.
+    # The attribute is looked up on the type so that instances
+    # with a permissive __getattr__ are not mistaken for dates.
+    if callable(getattr(type(obj), 'isoformat', None)):
+        return typing.cast(HasIsoFormat, obj).isoformat()
+    raise errors.NotSerializableError(obj)
+
+
+def json_serialize_hook(obj: object) -> SerializedValue:
     """Standard `default` function passed to json.dump
 
     This function is used to serialize a number of non-standard
@@ -283,19 +439,10 @@ def json_serialize_hook(
     | Pydantic models           | `obj.model_dump(by_alias=True)` |
 
     """
-    if isinstance(obj, HasIsoFormat):
-        return obj.isoformat()
-    if isinstance(
-        obj,
-        ipaddress.IPv4Address | ipaddress.IPv6Address | uuid.UUID | yarl.URL,
-    ):
-        return str(obj)
-    if isinstance(obj, datetime.timedelta):
-        return _format_isoduration(obj.total_seconds())
-    if isinstance(obj, pydantic.BaseModel):
-        return obj.model_dump(by_alias=True)
-
-    raise errors.NotSerializableError(obj)
+    # NB ... every type is dispatched through a ClassMapping so that
+    # repeated serializations of a type are a cache hit, including
+    # types that fall through to the isoformat probe or fail
+    return _serializers[type(obj)](obj)
 
 
 def convert_bool(value: str) -> bool:
@@ -330,16 +477,18 @@ def parse_datetime(value: str) -> datetime.datetime:
     Raises [pydantictornado.errors.ValueParseError][] if it
     cannot convert `value` to a Boolean value.
     """
-    formats = ['%Y', '%Y-%m', '%Y%m']
     with contextlib.suppress(ValueError):
         then = datetime.datetime.fromisoformat(value)
         if not then.tzinfo:
             then = then.replace(tzinfo=datetime.UTC)
         return then
-    for fmt in formats:
+    if match := _SHORT_DATE_PATTERN.fullmatch(value):
         with contextlib.suppress(ValueError):
-            return datetime.datetime.strptime(value, fmt).replace(
-                tzinfo=datetime.UTC
+            return datetime.datetime(
+                int(match['year']),
+                int(match['month'] or 1),
+                1,
+                tzinfo=datetime.UTC,
             )
     raise errors.ValueParseError(value, datetime.datetime)
 
@@ -354,13 +503,16 @@ class LooksAnnotated(typing.Protocol):
     __origin__: type
 
 
+# every typing.Annotated[...] alias is an instance of this type
+_ANNOTATED_ALIAS_TYPE = type(typing.Annotated[int, ''])
+
+
 def is_annotated(obj: object) -> typing.TypeGuard[LooksAnnotated]:
     """Guarantee that is annotated"""
-    # NB ... typing.get_origin() returns None when given a
-    # non-type value, so we ONLY return true for annotated
-    # type values which always have __origin__ and __metadata__
-    # attributes
-    return typing.get_origin(obj) == typing.Annotated
+    # NB ... checking type(obj) is cheaper than typing.get_origin()
+    # and, unlike probing for __metadata__, is not fooled by objects
+    # with a permissive __getattr__ such as mocks and proxies
+    return issubclass(type(obj), _ANNOTATED_ALIAS_TYPE)
 
 
 def strip_annotation(t: SomeType) -> SomeType:
@@ -370,6 +522,9 @@ def strip_annotation(t: SomeType) -> SomeType:
 
 def unwrap_annotation(v: T) -> tuple[T, typing.Sequence[object]]:
     """Separate the origin value and metadata if `v` is annotated"""
+    # NB ... this is not cached since Annotated aliases hash and
+    # compare by their metadata so a cache would return equal but
+    # not identical metadata, eg Annotated[int, 1] for Annotated[int, True]
     if is_annotated(v):
         return typing.cast(T, v.__origin__), v.__metadata__
     return v, ()
@@ -391,26 +546,54 @@ def clone_function(f: SomeCallable) -> SomeCallable:
         f.__defaults__,
         f.__closure__,
     )
-    functools.update_wrapper(new_func, f)
+    # NB ... copy the attributes directly instead of using
+    # functools.update_wrapper since the clone is a replacement
+    # for `f` and not a wrapper so __wrapped__ is not needed
+    new_func.__annotations__ = f.__annotations__
+    new_func.__doc__ = f.__doc__
+    new_func.__kwdefaults__ = f.__kwdefaults__
+    new_func.__module__ = f.__module__
+    new_func.__qualname__ = f.__qualname__
+    new_func.__type_params__ = f.__type_params__
+    new_func.__dict__.update(f.__dict__)
     return typing.cast(SomeCallable, new_func)
 
 
-def _format_isoduration(seconds: float) -> str:
-    if seconds == 0.0:  # noqa: PLR2004 -- magic value okay here
-        return 'PT0S'
-
-    parts = []
-    rem, prec = seconds, 6
-    for spec, reduction in [('S', 60), ('M', 60), ('H', 24)]:
-        rem, value = divmod(rem, reduction)
-        if value:
-            value = round(value, prec) if prec else int(value)
-            parts.append(f'{value}{spec}')
-        prec = 0
-
-    parts.append('T')
-    if rem:
-        parts.append(f'{int(rem)}D')
-    parts.append('P')
-
-    return ''.join(reversed(parts))
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+# NB ... durations tend to repeat (timeouts, intervals, etc.) so
+# a small cache skips the arithmetic and formatting entirely
+@functools.lru_cache(maxsize=256)
+def _format_isoduration(td: datetime.timedelta) -> str:
+    # NB ... working in integer microseconds avoids the rounding
+    # errors that total_seconds() has for long durations
+    seconds, micros = divmod(td // _ONE_MICROSECOND, 1_000_000)
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+
+    # NB ... formatting a float would produce exponents such as
+    # 1e-06 which are not valid ISO-8601
+    if micros:
+        seconds_part = f'{secs}.{micros:06d}'.rstrip('0') + 'S'
+    else:
+        seconds_part = f'{secs}S' if secs else ''
+    time_part = (
+        (f'{hours}H' if hours else '')
+        + (f'{minutes}M' if minutes else '')
+        + seconds_part
+    )
+    date_part = f'{days}D' if days else ''
+    if time_part:
+        return f'P{date_part}T{time_part}'
+    if date_part:
+        return f'P{date_part}'
+    return 'PT0S'
+
+
+# NB ... this is created last since populating a ClassMapping
+# uses functions defined throughout this module
+_serializers = ClassMapping[Serializer](
+    initialize_data=_initialize_serializers
+)
@@ -67,6 +67,22 @@ class DescribeTypeTests(unittest.TestCase):
             openapi.describe_type(yarl.URL),
         )
 
+    def test_describing_subclasses_of_simple_types(self) -> None:
+        class Identifier(uuid.UUID):
+            pass
+
+        self.assertEqual(
+            {'type': 'string', 'format': 'uuid'},
+            openapi.describe_type(Identifier),
+        )
+        description = openapi._describe_type(
+            typing.Annotated[int, openapi.SchemaExtra(minimum=0)]
+        )
+        self.assertEqual({'type': 'integer', 'minimum': 0}, description)
+        self.assertEqual({'type': 'integer'}, openapi.describe_type(int))
+        with self.assertRaises(TypeError):
+            openapi._SIMPLE_TYPE_SCHEMAS[int]['type'] = 'string'  # type: ignore[index]
+
     def test_describing_typed_collections(self) -> None:
         self.assertEqual(
             {'type': 'array', 'items': {'type': 'string'}},
@@ -113,6 +129,30 @@ class DescribeTypeTests(unittest.TestCase):
             result,
         )
 
+    def test_optional_types(self) -> None:
+        self.assertEqual(
+            {'anyOf': [{'type': 'integer'}, {'type': 'null'}]},
+            openapi.describe_type(int | None),
+        )
+        self.assertEqual(
+            {'anyOf': [{'type': 'null'}, {'type': 'string'}]},
+            openapi.describe_type(None | str),
+        )
+
+    def test_duplicate_union_members(self) -> None:
+        class Identifier(uuid.UUID):
+            pass
+
+        self.assertEqual(
+            {
+                'anyOf': [
+                    {'type': 'string', 'format': 'uuid'},
+                    {'type': 'null'},
+                ]
+            },
+            openapi.describe_type(uuid.UUID | Identifier | None),
+        )
+
     def test_complex_cases(self) -> None:
         result = openapi.describe_type(list[tuple[str, int] | list[str]])
         self.assertEqual(
@@ -157,6 +197,19 @@ class DescribeTypeTests(unittest.TestCase):
             },
             openapi.describe_type(typing.Literal[1, True, 'yes']),
         )
+        self.assertEqual(
+            {'type': 'string', 'enum': ['yes', 'no']},
+            openapi.describe_type(typing.Literal['yes', 'no']),
+        )
+        self.assertEqual(
+            {
+                'anyOf': [
+                    {'type': 'string', 'enum': ['yes', 'no']},
+                    {'type': 'boolean', 'const': False},
+                ]
+            },
+            openapi.describe_type(typing.Literal['yes', False, 'no']),
+        )
 
     def test_illegal_types(self) -> None:
         with self.assertWarnsRegex(RuntimeWarning, r'expected exactly one'):
@@ -198,6 +251,22 @@ class DescribeTypeTests(unittest.TestCase):
             openapi.describe_type(uuid.UUID | Widget),
         )
 
+    def test_that_model_schemas_are_reused(self) -> None:
+        class Widget(pydantic.BaseModel):
+            name: str
+
+        first = openapi._describe_type(Widget)
+        with unittest.mock.patch.object(
+            Widget, 'model_json_schema'
+        ) as model_json_schema:
+            second = openapi._describe_type(Widget)
+        model_json_schema.assert_not_called()
+        self.assertEqual(first, second)
+        first['properties']['name']['title'] = 'Changed'
+        self.assertEqual(
+            Widget.model_json_schema(), openapi._describe_type(Widget)
+        )
+
 
 class OpenAPIAnnotationTests(unittest.TestCase):
     def test_extra(self) -> None:
@@ -211,6 +280,16 @@ class OpenAPIAnnotationTests(unittest.TestCase):
             ),
         )
 
+    def test_unhashable_annotations(self) -> None:
+        self.assertEqual(
+            {'type': 'integer', 'title': 'Count'},
+            openapi.describe_type(
+                typing.Annotated[
+                    int, openapi.SchemaExtra(title='Count'), {'ignored': 1}
+                ]
+            ),
+        )
+
     def test_multiple_extra(self) -> None:
         self.assertEqual(
             {
@@ -244,6 +323,13 @@ class OpenAPIAnnotationTests(unittest.TestCase):
                 ]
             ),
         )
+        self.assertEqual(
+            {'type': 'string', 'format': 'uuid'},
+            openapi.describe_type(
+                typing.Annotated[uuid.UUID, OtherAnnotation()]
+            ),
+        )
+        self.assertEqual({}, openapi._NO_EXTRA.extra)
 
     def test_extras_at_multiple_levels(self) -> None:
         price = typing.Annotated[float, openapi.SchemaExtra(title='Item cost')]
@@ -276,7 +362,7 @@ class OpenAPIAnnotationTests(unittest.TestCase):
 class OpenAPIRegexTests(unittest.TestCase):
     @staticmethod
     def translate_path_pattern(pattern: str) -> openapi.OpenAPIPath:
-        return openapi._translate_path_pattern(re.compile(pattern))
+        return openapi._translate_path_pattern(pattern)
 
     def test_simple_paths(self) -> None:
         result = self.translate_path_pattern(r'/items/(?P<item_id>.*)')
@@ -294,6 +380,13 @@ class OpenAPIRegexTests(unittest.TestCase):
         self.assertEqual('/status/', result.path)
         self.assertDictEqual({}, result.patterns)
 
+        self.assertEqual(
+            self.translate_path_pattern(r'/items/(?P<item_id>\d+)$'),
+            openapi._translate_path_pattern(
+                re.compile(r'/items/(?P<item_id>\d+)$')
+            ),
+        )
+
     def test_path_cleanup(self) -> None:
         result = self.translate_path_pattern('/status/?')
         self.assertEqual('/status', result.path)
@@ -357,6 +450,11 @@ class OpenAPIRegexTests(unittest.TestCase):
             with self.assertWarns(UserWarning):
                 self.translate_path_pattern(pattern)
 
+        with self.assertWarnsRegex(UserWarning, r"^'\?=' is not implemented"):
+            result = self.translate_path_pattern(r'/(?P<name>\w+(?=-))')
+        self.assertEqual('/{name}', result.path)
+        self.assertEqual(r'\w+(?=-)', result.patterns['name'])
+
 
 class DescribeApiTests(unittest.TestCase):
     def test_application_without_routes(self) -> None:
@@ -484,6 +582,67 @@ class DescribeApiTests(unittest.TestCase):
         self.assertEqual(['get'], list(description['paths']['/']))
         self.assertEqual({}, description['paths']['/']['get'])
 
+    def test_that_first_matching_rule_is_described(self) -> None:
+        # fmt: off
+        async def get_item() -> None: pass
+        async def delete_item() -> None: pass
+        # fmt: on
+
+        app = web.Application(
+            [
+                routing.Route(r'/items', get=get_item),
+                routing.Route(r'/items', delete=delete_item),
+            ]
+        )
+        description = openapi.describe_api(app)
+        self.assertIsNotNone(description.paths['/items'].get)
+        self.assertIsNone(description.paths['/items'].delete)
+
+    def test_that_rules_for_the_same_path_are_merged(self) -> None:
+        # fmt: off
+        async def get_item(id_: int) -> None: pass
+        async def delete_item(id_: str) -> None: pass
+        async def other_get(id_: str) -> None: pass
+        # fmt: on
+
+        app = web.Application(
+            [
+                routing.Route(r'/items/(?P<id_>\d+)', get=get_item),
+                routing.Route(
+                    r'/items/(?P<id_>[a-z]+)',
+                    get=other_get,
+                    delete=delete_item,
+                ),
+            ]
+        )
+        description = openapi.describe_api(app).model_dump(by_alias=True)
+        path = description['paths']['/items/{id_}']
+        self.assertEqual({'parameters', 'get', 'delete'}, set(path))
+        self.assertEqual({'type': 'integer'}, path['parameters'][0]['schema'])
+        self.assertNotIn('parameters', path['get'])
+        self.assertEqual(
+            '[a-z]+', path['delete']['parameters'][0]['schema']['pattern']
+        )
+
+    def test_that_rule_descriptions_are_reused(self) -> None:
+        async def find_item(_id: uuid.UUID) -> None:
+            pass
+
+        route = routing.Route(r'/items/(?P<_id>.*)', get=find_item)
+        app = web.Application([route])
+        first = openapi.describe_api(app)
+        first.paths['/items/{_id}'].parameters.clear()
+        with unittest.mock.patch.object(
+            openapi, '_describe_path'
+        ) as describe_path:
+            second = openapi.describe_api(app)
+        describe_path.assert_not_called()
+        self.assertEqual(1, len(second.paths['/items/{_id}'].parameters))
+
+        path, _ = openapi._describe_rule(route)
+        with self.assertRaises(TypeError):
+            path.patterns['_id'] = '.+'  # type: ignore[index]
+
 
 class DescribePathTests(unittest.TestCase):
     def test_mixed_annotations(self) -> None:
@@ -676,6 +835,24 @@ class DescribePathTests(unittest.TestCase):
         op = tests.assert_is_not_none(description.put)
         self.assertEqual('Overwrite the thing', op.summary)
 
+    def test_that_handler_descriptions_are_reused(self) -> None:
+        class RequestHandler(web.RequestHandler):
+            def get(self) -> None:
+                """Retrieve a thing"""
+
+        first = openapi._describe_path(
+            web.url('/first', RequestHandler), openapi.OpenAPIPath()
+        )
+        with unittest.mock.patch.object(
+            openapi, '_describe_operation'
+        ) as describe_operation:
+            second = openapi._describe_path(
+                web.url('/second', RequestHandler), openapi.OpenAPIPath()
+            )
+        describe_operation.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIsNot(first.get, second.get)
+
     def test_invalid_web_url(self) -> None:
         description = openapi._describe_path(
             web.url('/', object), openapi.OpenAPIPath()
@@ -9,19 +9,32 @@ import uuid
 import pydantic
 import yarl
 from pydantictornado import openapi, request_handling, routing
-from tornado import http1connection, httputil, testing, web
+from tornado import http1connection, httpclient, httputil, testing, web
 from tornado.web import Application
 
 import tests
 
 
+# Passing the attribute names instead of the class skips the
+# per-mock scan of the class for coroutine functions
+_CONNECTION_SPEC = dir(http1connection.HTTP1Connection)
+
+
 def create_request(**kwargs: object) -> httputil.HTTPServerRequest:
-    kwargs.setdefault(
-        'connection', unittest.mock.Mock(spec=http1connection.HTTP1Connection)
-    )
+    kwargs.setdefault('connection', unittest.mock.Mock(spec=_CONNECTION_SPEC))
     return httputil.HTTPServerRequest(**kwargs)  # type: ignore[arg-type]
 
 
+async def noop_implementation(**_kwargs: object) -> None:
+    """Request method for tests that never await the implementation"""
+
+
+def get_content_type(response: httpclient.HTTPResponse) -> str:
+    """Return the content type of `response` without parameters"""
+    content_type = response.headers.get('content-type', 'binary/octet-stream')
+    return content_type.partition(';')[0].strip()
+
+
 class RequestTracker:
     def __init__(self) -> None:
         self.impl = unittest.mock.AsyncMock()
@@ -57,9 +70,7 @@ class RequestHandlerTests(unittest.IsolatedAsyncioTestCase):
     ) -> request_handling.RequestHandler:
         # NB ... HTTPServerRequest uses conn.set_close_callback which
         # does not exist on httputil.HTTPConnection :/
-        request_kwargs = {} if request_kwargs is None else request_kwargs
-        request_kwargs.setdefault('method', 'GET')
-        request = create_request(**request_kwargs)
+        request = create_request(**{'method': 'GET', **(request_kwargs or {})})
         return request_handling.RequestHandler(
             self.application, request, **kwargs
         )
@@ -68,17 +79,17 @@ class RequestHandlerTests(unittest.IsolatedAsyncioTestCase):
         handler = self.create_request_handler()
         self.assertEqual((), handler.SUPPORTED_METHODS)
 
-        handler = self.create_request_handler(get=unittest.mock.AsyncMock())
+        handler = self.create_request_handler(get=noop_implementation)
         self.assertEqual(('GET',), handler.SUPPORTED_METHODS)
 
-        kwargs = {
-            method.lower(): unittest.mock.AsyncMock()
-            for method in web.RequestHandler.SUPPORTED_METHODS
-        }
+        kwargs: dict[str, typing.Any] = dict.fromkeys(
+            (m.lower() for m in web.RequestHandler.SUPPORTED_METHODS),
+            noop_implementation,
+        )
         handler = self.create_request_handler(**kwargs)
         self.assertEqual(
-            sorted(web.RequestHandler.SUPPORTED_METHODS),
-            sorted(handler.SUPPORTED_METHODS),
+            frozenset(web.RequestHandler.SUPPORTED_METHODS),
+            frozenset(handler.SUPPORTED_METHODS),
         )
 
     def test_that_additional_kwargs_are_rejected(self) -> None:
@@ -87,21 +98,22 @@ class RequestHandlerTests(unittest.IsolatedAsyncioTestCase):
         self.assertIn('whatever', str(context.exception))
 
     async def test_that_unimplemented_method_fails(self) -> None:
+        # the handler only consults request.method when dispatching
+        # so a single handler is reused for each method
+        handler = self.create_request_handler(get=noop_implementation)
         for http_method in set(web.RequestHandler.SUPPORTED_METHODS) - {'GET'}:
-            handler = self.create_request_handler(
-                get=unittest.mock.AsyncMock(),
-                request_kwargs={'method': http_method},
-            )
-            method: request_handling.RequestMethod | None = getattr(
-                handler, http_method.lower(), None
-            )
-            method = tests.assert_is_not_none(method)
-            with self.assertRaises(web.HTTPError) as context:
-                await method()
-            self.assertEqual(
-                http.HTTPStatus.METHOD_NOT_ALLOWED,
-                context.exception.status_code,
-            )
+            with self.subTest(http_method=http_method):
+                handler.request.method = http_method
+                method: request_handling.RequestMethod | None = getattr(
+                    handler, http_method.lower(), None
+                )
+                method = tests.assert_is_not_none(method)
+                with self.assertRaises(web.HTTPError) as context:
+                    await method()
+                self.assertEqual(
+                    http.HTTPStatus.METHOD_NOT_ALLOWED,
+                    context.exception.status_code,
+                )
 
     async def test_that_handler_calls_implementation_functions(self) -> None:
         func = unittest.mock.AsyncMock()
@@ -111,6 +123,14 @@ class RequestHandlerTests(unittest.IsolatedAsyncioTestCase):
         func.assert_awaited_once()
         self.assertIsNone(response)
 
+    def test_that_signatures_are_reused(self) -> None:
+        async def impl(*, item_id: 'int') -> None:
+            pass
+
+        sig = request_handling._get_signature(impl)
+        self.assertIs(int, sig.parameters['item_id'].annotation)
+        self.assertIs(sig, request_handling._get_signature(impl))
+
     async def test_that_non_coroutine_implementation_fails(self) -> None:
         handler = self.create_request_handler(get=print)  # type: ignore[arg-type]
         with self.assertRaises(web.HTTPError) as context:
@@ -215,11 +235,8 @@ class ResponseHandlingTests(testing.AsyncHTTPTestCase):
         response = self.fetch('/', headers={'accept': 'application/json'})
         self.assertEqual(200, response.code)
         self.assertTrue(response.body, 'response body should not be empty')
-        self.assertEqual(
-            'application/json',
-            response.headers['content-type'].partition(';')[0].strip(),
-        )
-        body = json.loads(response.body.decode('utf-8'))
+        self.assertEqual('application/json', get_content_type(response))
+        body = json.loads(response.body)
         self.assertDictEqual(expected, body)
 
     def test_returning_null(self) -> None:
@@ -229,10 +246,7 @@ class ResponseHandlingTests(testing.AsyncHTTPTestCase):
         self.register_handler_function(r'/', 'GET', impl)
         response = self.fetch('/', headers={'accept': 'application/json'})
         self.assertEqual(200, response.code)
-        self.assertEqual(
-            'application/json',
-            response.headers['content-type'].partition(';')[0].strip(),
-        )
+        self.assertEqual('application/json', get_content_type(response))
         self.assertEqual(b'null', response.body)
 
     def test_library_types(self) -> None:
@@ -268,11 +282,8 @@ class ResponseHandlingTests(testing.AsyncHTTPTestCase):
         response = self.fetch('/', headers={'accept': 'application/json'})
         self.assertEqual(200, response.code)
         self.assertTrue(response.body, 'response body should not be empty')
-        self.assertEqual(
-            'application/json',
-            response.headers['content-type'].partition(';')[0].strip(),
-        )
-        body = json.loads(response.body.decode('utf-8'))
+        self.assertEqual('application/json', get_content_type(response))
+        body = json.loads(response.body)
         self.assertEqual(expected, body)
 
     def test_pydantic_request_body(self) -> None:
@@ -287,7 +298,7 @@ class ResponseHandlingTests(testing.AsyncHTTPTestCase):
             '/', method='POST', body=json.dumps({'value': 'foo'}).encode()
         )
         self.assertEqual(200, response.code)
-        self.assertEqual('foo', json.loads(response.body.decode('utf-8')))
+        self.assertEqual('foo', json.loads(response.body))
 
 
 class FullStackTests(testing.AsyncHTTPTestCase):
@@ -365,9 +376,8 @@ class FullStackTests(testing.AsyncHTTPTestCase):
     def test_request_echo(self) -> None:
         rsp = self.fetch('/request')
         self.assertEqual(200, rsp.code)
-        content_type = rsp.headers.get('content-type', 'binary/octet-stream')
-        self.assertEqual('application/json', content_type.split(';')[0])
-        body = json.loads(rsp.body.decode('utf-8'))
+        self.assertEqual('application/json', get_content_type(rsp))
+        body = json.loads(rsp.body)
         self.assertEqual('GET', body['method'])
         self.assertEqual(self.get_url('/request'), body['url'])
 
@@ -380,7 +390,7 @@ class FullStackTests(testing.AsyncHTTPTestCase):
         rsp = self.fetch('/items/42')
         self.assertEqual(200, rsp.code)
         self.assertTrue(self.handler_invoked, 'Handler not called')
-        body = json.loads(rsp.body.decode('utf-8'))
+        body = json.loads(rsp.body)
         self.assertDictEqual(
             {'is_int': True, 'is_uuid': False},
             body,
@@ -389,7 +399,7 @@ class FullStackTests(testing.AsyncHTTPTestCase):
         rsp = self.fetch('/items/00000000-0000-0000-0000-000000000000')
         self.assertEqual(200, rsp.code)
         self.assertTrue(self.handler_invoked, 'Handler not called')
-        body = json.loads(rsp.body.decode('utf-8'))
+        body = json.loads(rsp.body)
         self.assertDictEqual(
             {'is_int': False, 'is_uuid': True},
             body,
@@ -399,12 +409,12 @@ class FullStackTests(testing.AsyncHTTPTestCase):
         item_id = uuid.uuid4()
         rsp = self.fetch(f'/items/{item_id}', method='DELETE')
         self.assertEqual(200, rsp.code)
-        body = json.loads(rsp.body.decode('utf-8'))
+        body = json.loads(rsp.body)
         self.assertDictEqual({'item_id': str(item_id)}, body)
 
     def test_calling_described_operation(self) -> None:
         item_id = uuid.uuid4()
         rsp = self.fetch(f'/items/{item_id}')
         self.assertEqual(200, rsp.code)
-        body = json.loads(rsp.body.decode('utf-8'))
+        body = json.loads(rsp.body)
         self.assertDictEqual({'is_int': False, 'is_uuid': True}, body)
@@ -7,9 +7,14 @@ import typing
 import unittest.mock
 import uuid
 
+import pydantic
 from pydantictornado import errors, routing, util
 from tornado import web
 
+_IMPLEMENTATIONS = tuple(
+    n.lower() for n in web.RequestHandler.SUPPORTED_METHODS
+)
+
 
 class RouteTests(unittest.TestCase):
     def test_that_at_least_one_handler_must_be_included(self) -> None:
@@ -17,14 +22,14 @@ class RouteTests(unittest.TestCase):
             routing.Route('/')
         self.assertIn('HTTP method implementation', str(cm.exception))
 
-        implementations = {
-            n.lower() for n in web.RequestHandler.SUPPORTED_METHODS
-        }
-        for impl in implementations:
-            try:
-                routing.Route('/', **{impl: asyncio.sleep})
-            except Exception:  # noqa: BLE001 -- blind except ok due to fail()
-                self.fail(f'routing.Route failed though {impl!r} was defined')
+        for impl in _IMPLEMENTATIONS:
+            with self.subTest(impl=impl):
+                try:
+                    routing.Route('/', **{impl: asyncio.sleep})
+                except Exception:  # noqa: BLE001 -- blind except ok due to fail()
+                    self.fail(
+                        f'routing.Route failed though {impl!r} was defined'
+                    )
 
     def test_that_pattern_is_anchored_if_string(self) -> None:
         r = routing.Route('/', get=asyncio.sleep)
@@ -89,22 +94,23 @@ class RouteTests(unittest.TestCase):
             ),
         }
         for cls, (str_value, obj_value) in expectations.items():
+            with self.subTest(cls=cls):
 
-            async def impl(*, _obj: cls) -> None:  # type: ignore[valid-type]
-                pass
+                async def impl(*, _obj: cls) -> None:  # type: ignore[valid-type]
+                    pass
 
-            r = routing.Route(r'/(?P<_obj>.*)', get=impl)
-            result = r.target_kwargs['path_types']['_obj'](str_value)
-            self.assertTrue(
-                issubclass(type(result), cls),
-                f'parsing {str_value!r} produced incompatible'
-                f' type {type(result)}',
-            )
-            self.assertEqual(
-                obj_value,
-                result,
-                f'parsing {str_value!r} produced unexpected value',
-            )
+                r = routing.Route(r'/(?P<_obj>.*)', get=impl)
+                result = r.target_kwargs['path_types']['_obj'](str_value)
+                self.assertTrue(
+                    issubclass(type(result), cls),
+                    f'parsing {str_value!r} produced incompatible'
+                    f' type {type(result)}',
+                )
+                self.assertEqual(
+                    obj_value,
+                    result,
+                    f'parsing {str_value!r} produced unexpected value',
+                )
 
     def test_parsing_bool(self) -> None:
         async def impl(*, _flag: bool) -> None:
@@ -183,15 +189,19 @@ class RouteTests(unittest.TestCase):
         coercion_func = route.target_kwargs['path_types']['_when']
 
         for str_value, obj_value in expectations.items():
-            result = coercion_func(str_value)
-            self.assertEqual(
-                obj_value, result, f'Coercion failed for {str_value}'
-            )
+            with self.subTest(str_value=str_value):
+                result = coercion_func(str_value)
+                self.assertEqual(
+                    obj_value, result, f'Coercion failed for {str_value}'
+                )
 
-        for str_value in ('12/31/1999', ''):
-            with self.assertRaises(
-                errors.ValueParseError,
-                msg=f'_parse_datetime should have failed for {str_value!r}',
+        for str_value in ('12/31/1999', '1992-13', '1992-', ''):
+            with (
+                self.subTest(str_value=str_value),
+                self.assertRaises(
+                    errors.ValueParseError,
+                    msg=f'parse_datetime should have failed for {str_value!r}',
+                ),
             ):
                 coercion_func(str_value)
 
@@ -289,3 +299,10 @@ class EdgeCaseTests(unittest.TestCase):
             )
         )
         self.assertTrue(routing._compare(1, 1.0))
+
+    def test_that_parameter_annotations_are_immutable(self) -> None:
+        annotation = routing.ParameterAnnotation(description='whatever')
+        with self.assertRaises(pydantic.ValidationError):
+            annotation.description = 'something else'  # type: ignore[misc]
+        with self.assertRaises(pydantic.ValidationError):
+            routing.ParameterAnnotation(unknown='value')  # type: ignore[call-arg]
@@ -1,13 +1,47 @@
 import collections.abc
 import datetime
+import logging
 import typing
 import unittest.mock
+import weakref
 
 import pydantic
 from pydantictornado import errors, util
 
 
 class ClassMappingTests(unittest.TestCase):
+    def test_that_first_registered_base_wins(self) -> None:
+        # fmt: off
+        class A: ...
+        class C: ...
+        class D(A, C): ...
+        # fmt: on
+
+        mapping = util.ClassMapping[str]()
+        mapping[C] = 'C'
+        mapping[A] = 'A'
+        self.assertEqual('C', mapping[D])
+
+    def test_that_issubclass_failures_are_translated(self) -> None:
+        class SomeProtocol(typing.Protocol):
+            def some_method(self) -> None:
+                pass
+
+        mapping = util.ClassMapping[str]()
+        mapping[SomeProtocol] = 'protocol'
+        with (
+            self.assertLogs(mapping.logger, logging.ERROR),
+            self.assertRaises(errors.TypeRequiredError),
+        ):
+            mapping[int]
+
+    def test_that_abc_registrations_are_honored(self) -> None:
+        mapping = util.ClassMapping[str]()
+        mapping[collections.abc.Sized] = 'sized'
+        mapping[object] = 'object'
+        self.assertEqual('sized', mapping[list])
+        self.assertEqual('object', mapping[int])
+
     def test_subclass_handling(self) -> None:
         # fmt: off
         class A: ...
@@ -41,6 +75,19 @@ class ClassMappingTests(unittest.TestCase):
         self.assertEqual(mapping[C], 'C')
         self.assertEqual(mapping[D], 'D')
 
+    def test_virtual_subclass_handling(self) -> None:
+        class Sized:
+            def __len__(self) -> int:
+                return 0
+
+        mapping = util.ClassMapping[str]({collections.abc.Sized: 'sized'})
+        self.assertEqual('sized', mapping[Sized])
+        self.assertEqual('sized', mapping[list])
+
+        mapping[list] = 'list'
+        self.assertEqual('list', mapping[list])
+        self.assertEqual('sized', mapping[dict])
+
     def test_collection_features(self) -> None:
         mapping = util.ClassMapping[str]()
         mapping[bool] = 'bool'
@@ -111,6 +158,58 @@ class ClassMappingTests(unittest.TestCase):
         self.assertEqual(len(mapping), 3)
         self.assertEqual(len(mapping._cache), 3)
 
+    def test_update(self) -> None:
+        mapping = util.ClassMapping[str]({float: 'float'})
+        mapping.populate_cache()
+        mapping.update([(int, 'int'), (bool, 'bool')])
+        self.assertEqual(len(mapping._cache), 0)
+        self.assertListEqual([float, bool, int], list(mapping))
+        self.assertEqual(mapping[bool], 'bool')
+        self.assertEqual(mapping[int], 'int')
+
+        with self.assertRaises(errors.TypeRequiredError):
+            mapping.update({list[int]: 'list'})  # type: ignore[arg-type]
+
+    def test_lookups_after_failed_update(self) -> None:
+        mapping = util.ClassMapping[str]({object: 'object'})
+        self.assertEqual('object', mapping[int])
+
+        updates: list[tuple[typing.Any, str]] = [
+            (int, 'int'),
+            (list[int], 'list'),
+        ]
+        with self.assertRaises(errors.TypeRequiredError):
+            mapping.update(updates)
+        self.assertEqual('int', mapping[int])
+
+    def test_that_cache_is_bounded(self) -> None:
+        class BoundedMapping(util.ClassMapping[str]):
+            MAX_CACHE_SIZE = 2
+
+        mapping = BoundedMapping({object: 'object'})
+        for cls in (int, float, str, bytes):
+            self.assertEqual('object', mapping[cls])
+            self.assertLessEqual(len(mapping._cache), 2)
+        self.assertIn(bytes, mapping._cache)
+
+    def test_that_subclass_lookups_are_cached(self) -> None:
+        class MyInt(int):
+            pass
+
+        mapping = util.ClassMapping[str]({int: 'int', str: 'str'})
+        self.assertEqual('int', mapping[MyInt])
+        self.assertEqual('int', mapping._cache[MyInt])
+        self.assertEqual('str', mapping[str])
+        self.assertEqual('str', mapping._cache[str])
+
+    def test_annotated_lookups(self) -> None:
+        mapping = util.ClassMapping[str]({int: 'int'})
+        annotated_int = typing.Annotated[int, 'meta']
+        annotated_bool = typing.Annotated[bool, {}]
+        self.assertEqual('int', mapping[annotated_int])
+        self.assertEqual('int', mapping[annotated_bool])
+        self.assertNotIn(annotated_int, mapping._cache)
+
     def test_that_none_is_handled(self) -> None:
         none_type = type(None)
         mapping = util.ClassMapping[str]()
@@ -123,6 +222,37 @@ class JSONSerializationTests(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, r'object is not serializable'):
             util.json_serialize_hook(object())
 
+    def test_isoformat_serialization(self) -> None:
+        class Timestamp:
+            def isoformat(self) -> str:
+                return 'whenever'
+
+        class Date(datetime.date):
+            pass
+
+        self.assertEqual('whenever', util.json_serialize_hook(Timestamp()))
+        self.assertEqual(
+            '2024-01-02', util.json_serialize_hook(Date(2024, 1, 2))
+        )
+
+    def test_that_fallback_lookups_are_cached(self) -> None:
+        class Timestamp:
+            def isoformat(self) -> str:
+                return 'whenever'
+
+        class Opaque:
+            pass
+
+        self.assertEqual('whenever', util.json_serialize_hook(Timestamp()))
+        with self.assertRaises(errors.NotSerializableError):
+            util.json_serialize_hook(Opaque())
+        self.assertIn(Timestamp, util._serializers._cache)
+        self.assertIn(Opaque, util._serializers._cache)
+
+    def test_that_dynamic_attributes_are_not_serialized(self) -> None:
+        with self.assertRaises(errors.NotSerializableError):
+            util.json_serialize_hook(unittest.mock.Mock())
+
     def test_timedelta_serialization(self) -> None:
         expectations = [
             ('PT0S', datetime.timedelta()),
@@ -136,6 +266,15 @@ class JSONSerializationTests(unittest.TestCase):
             ('PT0.5S', datetime.timedelta(seconds=0.5)),
             ('PT0.123S', datetime.timedelta(milliseconds=123)),
             ('PT0.123456S', datetime.timedelta(microseconds=123456)),
+            ('P2D', datetime.timedelta(days=2)),
+            ('P1DT1M', datetime.timedelta(days=1, minutes=1)),
+            ('PT1H0.5S', datetime.timedelta(hours=1, seconds=0.5)),
+            (
+                'P999999DT0.0005S',
+                datetime.timedelta(days=999999, microseconds=500),
+            ),
+            ('PT0.000001S', datetime.timedelta(microseconds=1)),
+            ('PT1M4S', datetime.timedelta(minutes=1, seconds=4)),
         ]
         for expected, value in expectations:
             self.assertEqual(
@@ -157,6 +296,26 @@ class JSONSerializationTests(unittest.TestCase):
             typing.cast(dict[object, object], serialized),
         )
 
+    def test_that_model_dump_overrides_are_honored(self) -> None:
+        class Widget(pydantic.BaseModel):
+            name: str
+
+            def model_dump(
+                self,
+                **kwargs: typing.Any,  # noqa: ANN401
+            ) -> dict[str, typing.Any]:
+                result = super().model_dump(**kwargs)
+                result['kind'] = 'widget'
+                return result
+
+        self.assertDictEqual(
+            {'name': 'Something Useful', 'kind': 'widget'},
+            typing.cast(
+                dict[object, object],
+                util.json_serialize_hook(Widget(name='Something Useful')),
+            ),
+        )
+
     def test_pydantic_none_field_omission(self) -> None:
         class Widget(util.FieldOmittingMixin, pydantic.BaseModel):
             OMIT_IF_NONE = ('description',)
@@ -204,8 +363,61 @@ class JSONSerializationTests(unittest.TestCase):
             typing.cast(dict[object, object], serialized),
         )
 
+    def test_empty_field_omission_with_aliases(self) -> None:
+        class Widget(util.FieldOmittingMixin, pydantic.BaseModel):
+            OMIT_IF_EMPTY = ('tags_',)
+            name: str
+            tags_: list[str] = pydantic.Field(
+                default_factory=list, alias='tags'
+            )
+
+        widget = Widget(name='Something Useful')
+        self.assertDictEqual(
+            {'name': 'Something Useful'}, widget.model_dump(by_alias=True)
+        )
+        self.assertDictEqual(
+            {'name': 'Something Useful'}, widget.model_dump(by_alias=False)
+        )
+
+        widget.tags_.append('useful')
+        self.assertDictEqual(
+            {'name': 'Something Useful', 'tags': ['useful']},
+            widget.model_dump(by_alias=True),
+        )
+
+    @unittest.skipUnless(
+        'serialize_by_alias' in pydantic.ConfigDict.__annotations__,
+        'serialize_by_alias requires pydantic>=2.11',
+    )
+    def test_field_omission_with_serialize_by_alias(self) -> None:
+        class Widget(util.FieldOmittingMixin, pydantic.BaseModel):
+            model_config = pydantic.ConfigDict(serialize_by_alias=True)
+            OMIT_IF_EMPTY = ('tags',)
+            OMIT_IF_NONE = ('description',)
+            name: str = pydantic.Field(alias='NAME')
+            description: str | None = pydantic.Field(None, alias='DESC')
+            tags: list[str] = pydantic.Field(
+                default_factory=list, alias='TAGS'
+            )
+
+        widget = Widget(NAME='n')
+        self.assertDictEqual({'NAME': 'n'}, widget.model_dump())
+        self.assertDictEqual({'name': 'n'}, widget.model_dump(by_alias=False))
+
 
 class UtilityFunctionTests(unittest.TestCase):
+    def test_that_loggers_are_shared_by_class(self) -> None:
+        class C:
+            pass
+
+        instance = C()
+        self.assertIs(util.get_logger_for(C), util.get_logger_for(instance))
+        self.assertIs(util.get_logger_for(C()), util.get_logger_for(instance))
+
+        instance_ref = weakref.ref(instance)
+        del instance
+        self.assertIsNone(instance_ref(), 'logger cache retained instance')
+
     def test_apply_default_of_unspecified(self) -> None:
         self.assertIsNone(util.apply_default(None, util.UNSPECIFIED))
         self.assertIs(
@@ -225,6 +437,10 @@ class UtilityFunctionTests(unittest.TestCase):
             ),
         )
 
+    def test_that_unspecified_is_a_singleton(self) -> None:
+        self.assertIs(util.UNSPECIFIED, util.Unspecified())
+        self.assertFalse(util.Unspecified())
+
     def test_apply_default_of_none(self) -> None:
         self.assertEqual(
             unittest.mock.sentinel.value,
@@ -250,3 +466,58 @@ class UtilityFunctionTests(unittest.TestCase):
             unittest.mock.sentinel.default,
             util.apply_default(None, unittest.mock.sentinel.default),
         )
+
+    def test_is_annotated(self) -> None:
+        self.assertTrue(util.is_annotated(typing.Annotated[int, 'meta']))
+        self.assertTrue(
+            util.is_annotated(
+                typing.Annotated[typing.Annotated[int, 'inner'], 'outer']
+            )
+        )
+        for value in (
+            int,
+            list[int],
+            int | None,
+            typing.Literal[1],
+            None,
+            unittest.mock.Mock(),
+        ):
+            self.assertFalse(util.is_annotated(value), f'{value!r}')
+
+    def test_clone_function(self) -> None:
+        def f(a: int, *, b: str = 'b') -> str:
+            """Docstring"""
+            return f'{a}{b}'
+
+        f.custom = 'attribute'  # type: ignore[attr-defined]
+        clone = util.clone_function(f)
+        self.assertIsNot(f, clone)
+        self.assertEqual('1b', clone(1))
+        self.assertEqual('1c', clone(1, b='c'))
+        for attr in (
+            '__annotations__',
+            '__doc__',
+            '__module__',
+            '__name__',
+            '__qualname__',
+            'custom',
+        ):
+            self.assertEqual(getattr(f, attr), getattr(clone, attr), attr)
+
+    def test_unwrap_annotation(self) -> None:
+        self.assertEqual((int, ()), util.unwrap_annotation(int))
+        self.assertEqual(
+            (int, ('meta',)),
+            util.unwrap_annotation(typing.Annotated[int, 'meta']),
+        )
+        unhashable: dict[str, str] = {}
+        self.assertEqual(
+            (int, (unhashable,)),
+            util.unwrap_annotation(typing.Annotated[int, unhashable]),
+        )
+        self.assertEqual([1], util.strip_annotation([1]))  # type: ignore[type-var]
+
+    def test_that_unwrap_annotation_returns_the_given_metadata(self) -> None:
+        util.unwrap_annotation(typing.Annotated[int, 1])
+        _, md = util.unwrap_annotation(typing.Annotated[int, True])
+        self.assertIs(True, md[0])  # noqa: FBT003, positional bool ok